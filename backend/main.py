@@ -1,7 +1,10 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pdf_processor import process_pdfs
-import aiofiles
+from fastapi.responses import StreamingResponse
+from pdf_processor import compare_texts_in_pool, extract_texts
+from typing import Dict, Iterable, Iterator, List, Tuple
+import asyncio
+import json
 import os
 import logging
 from dotenv import load_dotenv
@@ -34,17 +37,54 @@ app.add_middleware(
 
 # Constants
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+STREAM_BATCH_SIZE = 1000  # NDJSON records per streamed chunk
 
-@app.post("/compare-pdfs/", response_model=dict)
-async def compare_pdfs(pdf1: UploadFile = File(...), pdf2: UploadFile = File(...)) -> dict:
-    """Compare two PDF files and return their differences and summary.
+def _stream_differences(differences: Iterable[Tuple[str, str]], summary: Dict[str, int]) -> Iterator[str]:
+    """Yield a comparison as NDJSON records.
+
+    Each difference is sent as {"type": change_type, "text": text}. The final record is
+    {"type": "summary", "summary": {...}}, or {"type": "error", "detail": ...} if the
+    comparison fails after streaming has started.
+
+    Args:
+        differences (Iterable[Tuple[str, str]]): Differences from ``compare_texts_in_pool``.
+        summary (Dict[str, int]): Summary of changes.
+
+    Yields:
+        str: Batches of up to ``STREAM_BATCH_SIZE`` newline-terminated JSON records.
+    """
+    # Records are sent in batches: each yield costs a threadpool hop and an ASGI send
+    batch: List[str] = []
+    try:
+        for change_type, text in differences:
+            batch.append(json.dumps({"type": change_type, "text": text}))
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield "\n".join(batch) + "\n"
+                batch = []
+    except Exception as e:
+        logger.error("Streaming comparison failed: %s", e)
+        batch.append(json.dumps({"type": "error", "detail": f"Text comparison failed: {str(e)}"}))
+        yield "\n".join(batch) + "\n"
+        return
+    logger.info("PDF comparison completed successfully")
+    batch.append(json.dumps({"type": "summary", "summary": summary}))
+    yield "\n".join(batch) + "\n"
+
+@app.post("/compare-pdfs/")
+async def compare_pdfs(
+    pdf1: UploadFile = File(...),
+    pdf2: UploadFile = File(...),
+    force_refresh: bool = Query(False, alias="forceRefresh"),
+) -> StreamingResponse:
+    """Compare two PDF files and stream their differences and summary as NDJSON.
 
     Args:
         pdf1 (UploadFile): The first PDF file to compare.
         pdf2 (UploadFile): The second PDF file to compare.
+        force_refresh (bool): Re-extract text even if a cached result exists.
 
     Returns:
-        dict: A dictionary containing 'differences' (list) and 'summary' (dict).
+        StreamingResponse: One JSON record per difference, followed by a summary record.
 
     Raises:
         HTTPException: If file validation fails or processing encounters an error.
@@ -53,41 +93,45 @@ async def compare_pdfs(pdf1: UploadFile = File(...), pdf2: UploadFile = File(...
     if not pdf1.filename.endswith(".pdf") or not pdf2.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-    # Define temporary file paths
-    pdf1_path = f"temp_{pdf1.filename}"
-    pdf2_path = f"temp_{pdf2.filename}"
-
     try:
         # Check file size before processing
         if pdf1.size > MAX_FILE_SIZE or pdf2.size > MAX_FILE_SIZE:
             raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
 
-        # Write uploaded files asynchronously to temporary locations
-        async with aiofiles.open(pdf1_path, "wb") as file1, aiofiles.open(pdf2_path, "wb") as file2:
-            await file1.write(await pdf1.read())
-            await file2.write(await pdf2.read())
+        # Hand the upload bytes straight to the processor, no temporary files
+        data1 = await pdf1.read()
+        data2 = await pdf2.read()
 
-        logger.info(f"Starting processing for PDFs: {pdf1.filename}, {pdf2.filename}")
-        differences, summary = process_pdfs(pdf1_path, pdf2_path)
-        logger.info("PDF comparison completed successfully")
-        return {"differences": differences, "summary": summary}
+        logger.info("Starting processing for PDFs: %s, %s", pdf1.filename, pdf2.filename)
+        # Run the CPU-bound extraction off the event loop
+        loop = asyncio.get_running_loop()
+        text1, text2 = await loop.run_in_executor(None, extract_texts, data1, data2, force_refresh)
+
+        # The diff is CPU-bound pure Python, so it runs in the extraction process pool and
+        # concurrent requests do not contend for this process's GIL
+        differences, summary = await loop.run_in_executor(None, compare_texts_in_pool, text1, text2)
 
     except ValueError as ve:
-        logger.error(f"Validation error: {str(ve)}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
-        logger.error(f"Unexpected error during PDF comparison: {str(e)}")
+        logger.error("Unexpected error during PDF comparison: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to process PDFs: {str(e)}")
-    finally:
-        # Clean up temporary files
-        for path in [pdf1_path, pdf2_path]:
-            if os.path.exists(path):
-                try:
-                    os.remove(path)
-                    logger.debug(f"Cleaned up temporary file: {path}")
-                except OSError as e:
-                    logger.warning(f"Failed to remove {path}: {str(e)}")
+
+    # Stream the diff in batches of rows instead of building one response body
+    return StreamingResponse(_stream_differences(differences, summary), media_type="application/x-ndjson")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Web workers on uvloop and httptools; WEB_CONCURRENCY overrides the count. Extraction runs
+    # in a process pool per web worker, and pdf_processor splits the CPUs between the pools.
+    web_workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+    os.environ["WEB_CONCURRENCY"] = str(web_workers)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=web_workers,
+        loop="uvloop",
+        http="httptools",
+    )
\ No newline at end of file
@@ -1,147 +1,837 @@
-import pdfplumber
-from difflib import Differ
+import fitz
+from diff_match_patch import diff_match_patch
 import pytesseract
+import zstandard as zstd
 from PIL import Image
-import io
+import hashlib
 import logging
 import os
-from typing import Tuple, List, Dict
+import multiprocessing
+import tempfile
+import threading
+import time
+from difflib import SequenceMatcher
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Iterator, Tuple, List, Dict, Optional, Union
+from dotenv import load_dotenv
+
+load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(pdf_file: str) -> str:
-    """Extract text from a PDF file, falling back to OCR if necessary.
+# OCR engine for scanned pages: "tesseract" (CPU, default) or "easyocr" (GPU, batched)
+OCR_BACKEND = os.getenv("OCR_BACKEND", "tesseract").lower()
+
+# EasyOCR batching parameters. Pages are rendered to a fixed height with their aspect ratio
+# kept, so every page reaches the recognizer at the same scale however many are batched.
+EASYOCR_BATCH_SIZE = 16
+EASYOCR_PAGE_HEIGHT = 2200
+
+# The EasyOCR reader holds the model on the GPU, so one dedicated process owns it and
+# serves every request of this web worker
+_easyocr_reader = None
+_easyocr_executor: Optional[Executor] = None
+_easyocr_executor_lock = threading.Lock()
+
+# Documents are read in page ranges of at least this many pages, spread over the extraction pool
+PARALLEL_PAGE_THRESHOLD = 32
+
+# PyMuPDF is not thread-safe, so documents are only opened under this lock within a process
+_fitz_lock = threading.Lock()
+
+# Scanned pages are rendered whole in grayscale at this resolution and OCR'd once per page
+OCR_DPI = 300
+# LSTM engine, single uniform block of text per page
+TESSERACT_CONFIG = "--oem 1 --psm 6"
+
+# The line-level Myers diff is pure Python and slows down sharply as the edit distance grows.
+# It gets a time budget that scales with input size up to DIFF_TIMEOUT seconds; documents
+# that exhaust it are diffed again with difflib, which stays fast on heavily edited text.
+DIFF_TIMEOUT = float(os.getenv("DIFF_TIMEOUT", "2"))
+DIFF_TIMEOUT_BASE = 1.0
+DIFF_TIMEOUT_PER_LINE = 0.0001
+
+# A PDF can be given as a file path, a binary file-like object, or raw bytes
+PdfSource = Union[str, BinaryIO, bytes]
+
+# Extracted text is cached on disk zstd-compressed, keyed by the SHA-256 of the PDF bytes
+# and a fingerprint of the extraction settings
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+CACHE_COMPRESSION_LEVEL = 3
+# Bump when extraction changes in a way the settings fingerprint does not capture
+CACHE_VERSION = 3
+# Least recently used entries are evicted once the cache grows past this size, which also
+# clears out entries left behind by a settings or CACHE_VERSION change
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_MB", "500")) * 1024 * 1024
+
+# zstd contexts are reused to amortize setup, but must not be shared between threads
+_zstd_local = threading.local()
+
+# Worker pool shared by all requests for page extraction and OCR, created on first use.
+# Each web worker process gets its own pool, so the CPUs are divided between them.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+EXTRACTION_WORKERS = max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+_extraction_executor: Optional[Executor] = None
+_extraction_workers = 1
+_extraction_executor_lock = threading.Lock()
+
+def _init_ocr_worker() -> None:
+    """Limit Tesseract to a single thread inside each OCR worker process."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+def _strip_page_end(text: str) -> str:
+    """Drop the newline (and Tesseract's form feed) ending a page's text, as pages are joined with newlines."""
+    text = text.removesuffix("\x0c")
+    return text.removesuffix("\n")
+
+def _render_gray(page: fitz.Page, zoom: float) -> fitz.Pixmap:
+    """Render a whole page as an 8-bit grayscale pixmap scaled by ``zoom``."""
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+
+def _ocr_pages(job: Tuple[str, str, List[int]]) -> List[Optional[str]]:
+    """Render pages and run Tesseract OCR on them in an extraction worker.
+
+    Pages are rendered one at a time inside the job, so only one page image is held in memory.
 
     Args:
-        pdf_file (str): Path to the PDF file.
+        job (Tuple[str, str, List[int]]): Path of a temporary copy of the PDF, PDF name, and
+            1-based numbers of the pages to OCR.
 
     Returns:
-        str: Extracted text from the PDF.
+        List[Optional[str]]: Text recognized on each page, or None where rendering or OCR failed.
+    """
+    path, pdf_name, page_nums = job
+    texts: List[Optional[str]] = []
+    with _fitz_lock, fitz.open(path) as doc:
+        for page_num in page_nums:
+            try:
+                pix = _render_gray(doc[page_num - 1], OCR_DPI / 72)
+                image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+                texts.append(_strip_page_end(pytesseract.image_to_string(image, config=TESSERACT_CONFIG)))
+            except Exception as e:
+                logger.warning("OCR failed for page %s of %s: %s", page_num, pdf_name, e)
+                texts.append(None)
+    return texts
+
+def _get_easyocr_reader():
+    """Return the shared EasyOCR reader, creating and warming it up on first use."""
+    global _easyocr_reader
+    if _easyocr_reader is None:
+        import easyocr
+        import numpy as np
+
+        logger.info("Initializing EasyOCR reader on GPU")
+        _easyocr_reader = easyocr.Reader(["en"], gpu=True, cudnn_benchmark=True)
+        # Run a dummy US Letter page so CUDA/cuDNN setup is not paid by the first real request
+        _easyocr_reader.readtext_batched(
+            [np.zeros((EASYOCR_PAGE_HEIGHT, EASYOCR_PAGE_HEIGHT * 17 // 22), dtype=np.uint8)],
+            batch_size=1,
+            detail=0,
+        )
+    return _easyocr_reader
+
+def _easyocr_pages(jobs: List[Tuple[str, str, List[int]]]) -> List[List[Optional[str]]]:
+    """Render pages of several PDFs and run EasyOCR on them in shared GPU batches.
+
+    Runs in the dedicated EasyOCR process.
+
+    Args:
+        jobs (List[Tuple[str, str, List[int]]]): Path of a temporary copy of the PDF, PDF name,
+            and 1-based numbers of the pages to OCR, for each PDF.
+
+    Returns:
+        List[List[Optional[str]]]: Text recognized on each page of each job, or None where
+        rendering failed.
+    """
+    import numpy as np
+
+    reader = _get_easyocr_reader()
+    texts: List[List[Optional[str]]] = [[None] * len(page_nums) for _, _, page_nums in jobs]
+    # Batched inputs must share a shape, so pages of all PDFs are grouped by their rendered size
+    groups: Dict[Tuple[int, int], List[Tuple[int, int, "np.ndarray"]]] = {}
+    for job_index, (path, pdf_name, page_nums) in enumerate(jobs):
+        with _fitz_lock, fitz.open(path) as doc:
+            for index, page_num in enumerate(page_nums):
+                page = doc[page_num - 1]
+                try:
+                    pix = _render_gray(page, EASYOCR_PAGE_HEIGHT / page.rect.height)
+                except Exception as e:
+                    logger.warning("Rendering failed for page %s of %s: %s", page_num, pdf_name, e)
+                    continue
+                image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+                groups.setdefault(image.shape, []).append((job_index, index, image))
+
+    for group in groups.values():
+        results = reader.readtext_batched(
+            [image for _, _, image in group],
+            batch_size=EASYOCR_BATCH_SIZE,
+            detail=0,
+        )
+        for (job_index, index, _), lines in zip(group, results):
+            texts[job_index][index] = "\n".join(lines)
+    return texts
+
+def _get_easyocr_executor() -> Executor:
+    """Return the single-worker pool that owns the EasyOCR reader, creating it on first use."""
+    global _easyocr_executor
+    with _easyocr_executor_lock:
+        if _easyocr_executor is None:
+            try:
+                _easyocr_executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            except (ImportError, NotImplementedError, OSError) as e:
+                # A single thread is then the only owner of the reader
+                logger.warning("Process pool unavailable, running EasyOCR in a thread: %s", e)
+                _easyocr_executor = ThreadPoolExecutor(max_workers=1)
+        return _easyocr_executor
+
+def _run_easyocr(jobs: List[Tuple[str, str, List[int]]]) -> List[List[Optional[str]]]:
+    """Run EasyOCR on pages of several PDFs in the dedicated EasyOCR process.
+
+    Args:
+        jobs (List[Tuple[str, str, List[int]]]): Path of a temporary copy of the PDF, PDF name,
+            and 1-based numbers of the pages to OCR, for each PDF.
+
+    Returns:
+        List[List[Optional[str]]]: OCR text for each page of each job, None where OCR failed.
 
     Raises:
-        ValueError: If the file is invalid, empty, or no text is extracted.
+        RuntimeError: If the EasyOCR process crashed.
     """
-    # Validate file existence and basic integrity
-    if not os.path.exists(pdf_file) or os.path.getsize(pdf_file) == 0:
-        raise ValueError(f"Invalid PDF file: {pdf_file} does not exist or is empty")
+    global _easyocr_executor
+    executor = _get_easyocr_executor()
+    try:
+        return executor.submit(_easyocr_pages, jobs).result()
+    except BrokenProcessPool:
+        # Drop the crashed pool; raising RuntimeError keeps the healthy extraction pool alive
+        with _easyocr_executor_lock:
+            if _easyocr_executor is executor:
+                _easyocr_executor = None
+        raise RuntimeError("EasyOCR process terminated abruptly")
+
+def _run_ocr(executor: Executor, jobs: List[Tuple[str, str, List[int]]]) -> List[List[Optional[str]]]:
+    """Run OCR on pages of several PDFs with the engine selected by ``OCR_BACKEND``.
 
-    text = ""
+    Args:
+        executor (Executor): Shared extraction pool, used for Tesseract.
+        jobs (List[Tuple[str, str, List[int]]]): Path of a temporary copy of the PDF, PDF name,
+            and 1-based numbers of the pages to OCR, for each PDF.
+
+    Returns:
+        List[List[Optional[str]]]: OCR text for each page of each job, in the same order as
+        ``jobs``, None where OCR failed.
+    """
+    if OCR_BACKEND == "easyocr":
+        # A single job, so the pages of all PDFs reach the GPU together
+        return _run_easyocr(jobs)
+
+    # Contiguous chunks of pages, one single-threaded Tesseract per pool worker. Chunks of
+    # all PDFs are submitted before any result is awaited, so the PDFs are OCR'd side by side.
+    futures = []
+    for path, pdf_name, page_nums in jobs:
+        chunks = min(_extraction_workers, len(page_nums))
+        bounds = [len(page_nums) * i // chunks for i in range(chunks + 1)]
+        futures.append([executor.submit(_ocr_pages, (path, pdf_name, page_nums[lo:hi])) for lo, hi in zip(bounds, bounds[1:])])
+    return [[text for future in chunk_futures for text in future.result()] for chunk_futures in futures]
+
+def _describe_source(pdf_source: PdfSource) -> str:
+    """Return a short name for a PDF source, for log and error messages."""
+    if isinstance(pdf_source, str):
+        return pdf_source
+    return getattr(pdf_source, "name", None) or "in-memory PDF"
+
+def _read_pdf_bytes(pdf_source: PdfSource) -> bytes:
+    """Return the raw bytes of a PDF given as a path, file-like object, or bytes.
+
+    Args:
+        pdf_source (PdfSource): Path, binary file-like object, or bytes of the PDF.
+
+    Returns:
+        bytes: Contents of the PDF.
+
+    Raises:
+        ValueError: If the file does not exist or is empty.
+    """
+    if isinstance(pdf_source, (bytes, bytearray)):
+        data = bytes(pdf_source)
+    elif isinstance(pdf_source, str):
+        if not os.path.exists(pdf_source):
+            raise ValueError(f"Invalid PDF file: {pdf_source} does not exist or is empty")
+        with open(pdf_source, "rb") as f:
+            data = f.read()
+    else:
+        data = pdf_source.read()
+
+    if not data:
+        raise ValueError(f"Invalid PDF file: {_describe_source(pdf_source)} does not exist or is empty")
+    return data
+
+def _invalid_pdf_error(pdf_name: str, e: Exception) -> ValueError:
+    """Return the ValueError reported for a PDF that PyMuPDF failed to read."""
+    # Opening from a path raises FileDataError; opening from a stream surfaces MuPDF's format error
+    if isinstance(e, (fitz.FileDataError, fitz.mupdf.FzErrorFormat)):
+        return ValueError(f"Invalid PDF structure in {pdf_name}: Missing /Root object or corrupted")
+    logger.error("Text extraction failed for %s: %s", pdf_name, e)
+    return ValueError(f"Failed to extract text: {str(e)}")
+
+def _count_pages(data: bytes, pdf_name: str) -> int:
+    """Return the number of pages in PDF bytes.
+
+    Raises:
+        ValueError: If the PDF is corrupt or cannot be read.
+    """
+    try:
+        with _fitz_lock, fitz.open(stream=data, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception as e:
+        raise _invalid_pdf_error(pdf_name, e)
+
+def _write_temp_pdf(data: bytes) -> str:
+    """Write PDF bytes to a temporary file and return its path.
+
+    Workers open the file themselves, so the bytes are not pickled into every job.
+    """
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+def _extract_page_range(job: Tuple[str, str, int, int]) -> List[Tuple[int, Optional[str]]]:
+    """Extract text from a range of pages, flagging text-less scanned pages for OCR.
+
+    Args:
+        job (Tuple[str, str, int, int]): Path of a temporary copy of the PDF, PDF name, and
+            the [start, stop) page indices to process.
+
+    Returns:
+        List[Tuple[int, Optional[str]]]: (page_num, text) for each page with content, where
+        text is None for scanned pages that need OCR.
+
+    Raises:
+        ValueError: If the PDF is corrupt or cannot be read.
+    """
+    path, pdf_name, start, stop = job
+    pages: List[Tuple[int, Optional[str]]] = []
     try:
-        with pdfplumber.open(pdf_file) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
+        with _fitz_lock, fitz.open(path) as doc:
+            for page_num in range(start + 1, stop + 1):
+                page = doc[page_num - 1]
                 # Attempt direct text extraction
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                    logger.debug(f"Page {page_num}: Extracted {len(page_text)} characters")
-                else:
-                    # Fallback to OCR for scanned or image-based pages
-                    logger.info(f"Page {page_num}: No text found, attempting OCR")
-                    if page.images:
-                        for img_idx, img in enumerate(page.images, 1):
-                            try:
-                                img_data = img["stream"].get_data()
-                                img_pil = Image.open(io.BytesIO(img_data))
-                                ocr_text = pytesseract.image_to_string(img_pil)
-                                text += ocr_text + "\n"
-                                logger.debug(f"Page {page_num}, Image {img_idx}: OCR extracted {len(ocr_text)} chars")
-                            except Exception as img_e:
-                                logger.warning(f"OCR failed for image {img_idx} on page {page_num}: {str(img_e)}")
-
-        # Check if any text was extracted
-        if not text.strip():
-            raise ValueError("No text could be extracted from the PDF (empty or unsupported format)")
-
-        logger.info(f"Total text extracted from {pdf_file}: {len(text)} characters")
-        return text
-
-    except pdfplumber.pdfminer.PDFSyntaxError:
-        raise ValueError(f"Invalid PDF structure in {pdf_file}: Missing /Root object or corrupted")
+                page_text = page.get_text("text")
+                if page_text.strip():
+                    pages.append((page_num, _strip_page_end(page_text)))
+                    logger.debug("Page %s: Extracted %d characters", page_num, len(page_text))
+                elif page.get_images():
+                    # Scanned or image-based pages are rendered whole by the OCR job
+                    logger.info("Page %s: No text found, queueing page for OCR", page_num)
+                    pages.append((page_num, None))
+            return pages
+
+    # Only ValueError is raised back to the parent, as MuPDF exceptions do not pickle reliably
     except Exception as e:
-        logger.error(f"Text extraction failed for {pdf_file}: {str(e)}")
-        raise ValueError(f"Failed to extract text: {str(e)}")
+        raise _invalid_pdf_error(pdf_name, e)
 
-def compare_texts(text1: str, text2: str) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
-    """Compare two texts line-by-line and categorize differences.
+def _submit_page_ranges(executor: Executor, path: str, pdf_name: str, page_count: int) -> List[Future]:
+    """Split a document into contiguous page ranges and submit them to the pool.
 
     Args:
-        text1 (str): Text from the first PDF.
-        text2 (str): Text from the second PDF.
+        executor (Executor): Shared extraction pool.
+        path (str): Path of a temporary copy of the PDF.
+        pdf_name (str): Name of the PDF, used in log and error messages.
+        page_count (int): Number of pages in the PDF.
 
     Returns:
-        Tuple[List[Tuple[str, str]], Dict[str, int]]: Differences list and summary dictionary.
+        List[Future]: Futures of ``_extract_page_range`` results, in page order.
     """
+    ranges = max(1, min(_extraction_workers, -(-page_count // PARALLEL_PAGE_THRESHOLD)))
+    bounds = [page_count * i // ranges for i in range(ranges + 1)]
+    logger.info("Extracting %s pages from %s in %s ranges", page_count, pdf_name, ranges)
+    return [executor.submit(_extract_page_range, (path, pdf_name, lo, hi)) for lo, hi in zip(bounds, bounds[1:])]
+
+def _extract_documents(documents: List[Tuple[bytes, str]]) -> List[Tuple[str, bool]]:
+    """Extract text from PDFs on the shared extraction pool, falling back to OCR if necessary.
+
+    Runs in the caller, which only schedules work: page ranges and OCR jobs of all
+    documents are spread over the pool's workers.
+
+    Args:
+        documents (List[Tuple[bytes, str]]): Contents and name of each PDF.
+
+    Returns:
+        List[Tuple[str, bool]]: Extracted text of each PDF, in the same order as ``documents``,
+        and whether every scanned page was OCR'd successfully.
+
+    Raises:
+        ValueError: If a file is invalid, empty, or no text is extracted.
+    """
+    executor = _get_extraction_executor()
+    page_counts = [_count_pages(data, pdf_name) for data, pdf_name in documents]
+    paths: List[str] = []
     try:
-        # Initialize Differ for line-by-line comparison
-        differ = Differ()
-        diff = list(differ.compare(text1.splitlines(keepends=True), text2.splitlines(keepends=True)))
-
-        differences: List[Tuple[str, str]] = []
-        summary: Dict[str, int] = {"additions": 0, "deletions": 0, "modifications": 0}
-        index = 0
-
-        # Process the diff output
-        while index < len(diff):
-            line = diff[index]
-            if line.startswith("+ "):
-                differences.append(("added", line[2:]))
-                summary["additions"] += 1
-                index += 1
-            elif line.startswith("- "):
-                if index + 1 < len(diff) and diff[index + 1].startswith("+ "):
-                    differences.append(("modified", f"Old: {line[2:]}New: {diff[index + 1][2:]}"))
-                    summary["modifications"] += 1
-                    index += 2
+        for data, _ in documents:
+            paths.append(_write_temp_pdf(data))
+        # Submit every range of every document before waiting on any of them
+        range_futures = [
+            _submit_page_ranges(executor, path, pdf_name, page_count)
+            for path, (_, pdf_name), page_count in zip(paths, documents, page_counts)
+        ]
+
+        # Each entry is either extracted page text or None, a placeholder for OCR output
+        doc_parts: List[List[Optional[str]]] = []
+        ocr_slots: List[List[int]] = []
+        ocr_jobs: List[Tuple[str, str, List[int]]] = []
+        for path, (_, pdf_name), futures in zip(paths, documents, range_futures):
+            pages = [page for future in futures for page in future.result()]
+
+            text_parts: List[Optional[str]] = []
+            slots: List[int] = []
+            ocr_pages: List[int] = []
+            for page_num, page_text in pages:
+                if page_text is not None:
+                    text_parts.append(page_text)
                 else:
-                    differences.append(("removed", line[2:]))
-                    summary["deletions"] += 1
-                    index += 1
-            elif line.startswith("  "):
-                differences.append(("unchanged", line[2:]))
-                index += 1
+                    ocr_pages.append(page_num)
+                    slots.append(len(text_parts))
+                    text_parts.append(None)
+            doc_parts.append(text_parts)
+            if ocr_pages:
+                logger.info("Running OCR on %d pages from %s", len(ocr_pages), pdf_name)
+                ocr_slots.append(slots)
+                ocr_jobs.append((path, pdf_name, ocr_pages))
+            else:
+                ocr_slots.append([])
+
+        # OCR the scanned pages of all documents in one go and slot the results back in page order
+        ocr_results = iter(_run_ocr(executor, ocr_jobs) if ocr_jobs else [])
+        texts = []
+        for (_, pdf_name), text_parts, slots in zip(documents, doc_parts, ocr_slots):
+            ocr_texts = next(ocr_results) if slots else []
+            for slot, ocr_text in zip(slots, ocr_texts):
+                text_parts[slot] = ocr_text or ""
+            failed = ocr_texts.count(None)
+            if failed:
+                logger.warning("OCR failed on %d of %d scanned pages from %s", failed, len(ocr_texts), pdf_name)
+
+            text = "\n".join(text_parts)
+
+            # Check if any text was extracted
+            if not text.strip():
+                raise ValueError("No text could be extracted from the PDF (empty or unsupported format)")
+
+            logger.info("Total text extracted from %s: %d characters", pdf_name, len(text))
+            texts.append((text, not failed))
+        return texts
+
+    except BrokenProcessPool:
+        _drop_extraction_executor(executor)
+        raise
+    finally:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning("Failed to remove temporary PDF %s: %s", path, e)
+
+def _zstd_contexts() -> Tuple[zstd.ZstdCompressor, zstd.ZstdDecompressor]:
+    """Return this thread's reusable zstd compressor and decompressor."""
+    if not hasattr(_zstd_local, "cctx"):
+        _zstd_local.cctx = zstd.ZstdCompressor(level=CACHE_COMPRESSION_LEVEL)
+        _zstd_local.dctx = zstd.ZstdDecompressor()
+    return _zstd_local.cctx, _zstd_local.dctx
+
+def _settings_fingerprint() -> str:
+    """Return a short hash of every setting that changes the extracted text."""
+    settings = repr((CACHE_VERSION, OCR_BACKEND, OCR_DPI, TESSERACT_CONFIG, EASYOCR_PAGE_HEIGHT))
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+
+def _cache_path(digest: str) -> str:
+    """Return the cache file path for a PDF digest under the current extraction settings."""
+    return os.path.join(CACHE_DIR, f"{digest}-{_settings_fingerprint()}.txt.zst")
+
+def _load_cached_text(digest: str, pdf_name: str) -> Optional[str]:
+    """Read cached text for a PDF digest.
+
+    Args:
+        digest (str): SHA-256 hex digest of the PDF bytes.
+        pdf_name (str): Name of the PDF, used in log messages.
+
+    Returns:
+        Optional[str]: Previously extracted text, or None if nothing usable is cached.
+    """
+    try:
+        with open(_cache_path(digest), "rb") as f:
+            compressed = f.read()
+        text = _zstd_contexts()[1].decompress(compressed).decode("utf-8")
+    except FileNotFoundError:
+        return None
+    except (OSError, zstd.ZstdError, UnicodeDecodeError) as e:
+        logger.warning("Ignoring unreadable cache entry %s: %s", digest, e)
+        return None
+    logger.info("Cache hit for %s (%s)", pdf_name, digest)
+    # Mark the entry as recently used for eviction
+    try:
+        os.utime(_cache_path(digest))
+    except OSError:
+        pass
+    return text
+
+def _evict_cached_texts() -> None:
+    """Delete least recently used cache entries until the cache fits in ``CACHE_MAX_BYTES``."""
+    stats: List[Tuple[float, int, str]] = []
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".txt.zst"):
+                    stat = entry.stat()
+                    stats.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError as e:
+        logger.warning("Failed to scan text cache: %s", e)
+        return
+
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            # Another process may have evicted it first
+            pass
+        total -= size
+
+def _store_cached_text(digest: str, text: str) -> None:
+    """Atomically write extracted text, zstd-compressed, to the on-disk cache.
+
+    Args:
+        digest (str): SHA-256 hex digest of the PDF bytes.
+        text (str): Extracted text to cache.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_zstd_contexts()[0].compress(text.encode("utf-8")))
+        os.replace(tmp_path, _cache_path(digest))
+    except OSError as e:
+        logger.warning("Failed to cache extracted text for %s: %s", digest, e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    _evict_cached_texts()
+
+def _extract_with_cache(documents: List[Tuple[bytes, str]], force_refresh: bool) -> List[str]:
+    """Extract text from PDFs, reusing cached results and extracting identical content once.
+
+    Args:
+        documents (List[Tuple[bytes, str]]): Contents and name of each PDF.
+        force_refresh (bool): Ignore cached text and extract again.
+
+    Returns:
+        List[str]: Extracted text of each PDF, in the same order as ``documents``.
+
+    Raises:
+        ValueError: If a file is invalid, empty, or no text is extracted.
+    """
+    digests = [hashlib.sha256(data).hexdigest() for data, _ in documents]
+    texts: Dict[str, str] = {}
+    missing: Dict[str, Tuple[bytes, str]] = {}
+    for (data, pdf_name), digest in zip(documents, digests):
+        if digest in texts or digest in missing:
+            logger.info("%s is byte-identical to an earlier PDF, extracting text once", pdf_name)
+            continue
+        text = None if force_refresh else _load_cached_text(digest, pdf_name)
+        if text is None:
+            missing[digest] = (data, pdf_name)
+        else:
+            texts[digest] = text
+
+    if missing:
+        for (digest, (_, pdf_name)), (text, complete) in zip(missing.items(), _extract_documents(list(missing.values()))):
+            # Text with failed OCR pages is not cached, so the pages are retried next time
+            if complete:
+                _store_cached_text(digest, text)
             else:
-                index += 1  # Skip '?' lines (character-level diff markers)
+                logger.warning("Not caching incomplete text of %s", pdf_name)
+            texts[digest] = text
+    return [texts[digest] for digest in digests]
+
+def extract_text_from_pdf(pdf_source: PdfSource, force_refresh: bool = False) -> str:
+    """Extract text from a PDF, reusing cached results for identical content.
+
+    Args:
+        pdf_source (PdfSource): Path, binary file-like object, or bytes of the PDF.
+        force_refresh (bool): Ignore cached text and extract again.
+
+    Returns:
+        str: Extracted text from the PDF.
+
+    Raises:
+        ValueError: If the file is invalid, empty, or no text is extracted.
+    """
+    # Validate file existence and basic integrity
+    data = _read_pdf_bytes(pdf_source)
+    return _extract_with_cache([(data, _describe_source(pdf_source))], force_refresh)[0]
+
+def _lines_to_chars(lines1: List[str], lines2: List[str]) -> Tuple[str, str, List[str]]:
+    """Encode each unique line as a single character for a line-level diff.
+
+    Args:
+        lines1 (List[str]): Lines of the first text.
+        lines2 (List[str]): Lines of the second text.
+
+    Returns:
+        Tuple[str, str, List[str]]: Encoded first text, encoded second text, and the
+        line array where ``line_array[ord(char)]`` is the line a character stands for.
+    """
+    line_array: List[str] = []
+    line_index: Dict[str, int] = {}
+
+    def encode(lines: List[str]) -> str:
+        chars = []
+        for line in lines:
+            index = line_index.get(line)
+            if index is None:
+                index = line_index[line] = len(line_array)
+                line_array.append(line)
+            chars.append(chr(index))
+        return "".join(chars)
+
+    return encode(lines1), encode(lines2), line_array
+
+def _iter_differences(diff: List[Tuple[int, str]], line_array: List[str], summary: Dict[str, int]) -> Iterator[Tuple[str, str]]:
+    """Turn a line-encoded diff into categorized differences.
 
-        logger.info(f"Text comparison completed: {summary}")
-        return differences, summary
+    Args:
+        diff (List[Tuple[int, str]]): (op, chars) tuples from ``diff_main``.
+        line_array (List[str]): Line each encoded character stands for.
+        summary (Dict[str, int]): Counters updated in place while differences are yielded.
+
+    Yields:
+        Tuple[str, str]: (change_type, text) for each line, in document order.
+    """
+    removed: List[str] = []
+    added: List[str] = []
+
+    # Route changed lines to their pending list by op code; anything else is EQUAL
+    pending = {diff_match_patch.DIFF_DELETE: removed, diff_match_patch.DIFF_INSERT: added}.get
+
+    # Process the diff output, pairing removed lines with the lines that replace them.
+    # A trailing empty EQUAL chunk flushes the final change block.
+    diff.append((diff_match_patch.DIFF_EQUAL, ""))
+    for op, chunk in diff:
+        lines = [line_array[ord(char)] for char in chunk]
+        target = pending(op)
+        if target is not None:
+            target.extend(lines)
+            continue
+
+        # Flush the pending change block a whole run at a time rather than line by line
+        if removed or added:
+            paired = min(len(removed), len(added))
+            summary["modifications"] += paired
+            summary["deletions"] += len(removed) - paired
+            summary["additions"] += len(added) - paired
+            yield from (("modified", f"Old: {old}\nNew: {new}") for old, new in zip(removed, added))
+            yield from (("removed", line) for line in removed[paired:])
+            yield from (("added", line) for line in added[paired:])
+            removed.clear()
+            added.clear()
+        yield from (("unchanged", line) for line in lines)
+
+    logger.info("Text comparison completed: %s", summary)
+
+def _sequence_matcher_diff(chars1: str, chars2: str) -> List[Tuple[int, str]]:
+    """Diff two line-encoded texts with difflib, in ``diff_main`` output format.
+
+    Args:
+        chars1 (str): Encoded first text.
+        chars2 (str): Encoded second text.
+
+    Returns:
+        List[Tuple[int, str]]: (op, chars) tuples, with deletions before insertions in a replace.
+    """
+    diff: List[Tuple[int, str]] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, chars1, chars2, autojunk=False).get_opcodes():
+        if tag == "equal":
+            diff.append((diff_match_patch.DIFF_EQUAL, chars1[i1:i2]))
+            continue
+        if i2 > i1:
+            diff.append((diff_match_patch.DIFF_DELETE, chars1[i1:i2]))
+        if j2 > j1:
+            diff.append((diff_match_patch.DIFF_INSERT, chars2[j1:j2]))
+    return diff
 
+def compare_texts(text1: str, text2: str, summary: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, str]]:
+    """Compare two texts line-by-line and return an iterator of categorized differences.
+
+    The diff is computed up front, so failures surface here rather than while iterating;
+    differences are then produced lazily.
+
+    Args:
+        text1 (str): Text from the first PDF.
+        text2 (str): Text from the second PDF.
+        summary (Optional[Dict[str, int]]): Counters for 'additions', 'deletions' and
+            'modifications', updated in place while differences are iterated.
+
+    Returns:
+        Iterator[Tuple[str, str]]: (change_type, text) for each line, in document order.
+
+    Raises:
+        ValueError: If the comparison fails.
+    """
+    if summary is None:
+        summary = {"additions": 0, "deletions": 0, "modifications": 0}
+
+    try:
+        lines1 = text1.splitlines()
+        lines2 = text2.splitlines()
+
+        # Identical texts cannot differ: skip the diff entirely
+        if lines1 == lines2:
+            logger.info("Texts are identical, skipping diff")
+            return (("unchanged", line) for line in lines1)
+
+        # Encode every unique line as a single character, so the Myers diff runs
+        # line-by-line and chunks map straight back to lines
+        dmp = diff_match_patch()
+        timeout = min(DIFF_TIMEOUT, DIFF_TIMEOUT_BASE + (len(lines1) + len(lines2)) * DIFF_TIMEOUT_PER_LINE)
+        dmp.Diff_Timeout = timeout
+        chars1, chars2, line_array = _lines_to_chars(lines1, lines2)
+        started = time.monotonic()
+        diff = dmp.diff_main(chars1, chars2, False)
+
+        # On timeout diff_main returns a coarse, misleading diff, so redo it with difflib
+        if time.monotonic() - started >= timeout:
+            logger.info("Myers diff exceeded %.1fs, falling back to difflib", timeout)
+            diff = _sequence_matcher_diff(chars1, chars2)
+
+        return _iter_differences(diff, line_array, summary)
+
+    except ValueError as ve:
+        logger.error("Failed to compare texts: %s", ve)
+        raise
     except Exception as e:
-        logger.error(f"Failed to compare texts: {str(e)}")
+        logger.error("Failed to compare texts: %s", e)
         raise ValueError(f"Text comparison failed: {str(e)}")
 
-def process_pdfs(pdf1_path: str, pdf2_path: str) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
-    """Process two PDF files and return their comparison results.
+def _get_extraction_executor() -> Executor:
+    """Return the shared page extraction and OCR pool, creating it on first use.
+
+    Returns:
+        Executor: A process pool of ``EXTRACTION_WORKERS`` spawned workers, or a
+        single-thread pool where multiprocessing is unavailable.
+    """
+    global _extraction_executor, _extraction_workers
+    with _extraction_executor_lock:
+        if _extraction_executor is None:
+            try:
+                # Spawn rather than fork: the web process runs threads, which fork does not copy safely
+                _extraction_executor = ProcessPoolExecutor(
+                    max_workers=EXTRACTION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                )
+                _extraction_workers = EXTRACTION_WORKERS
+            except (ImportError, NotImplementedError, OSError) as e:
+                # Some platforms and frozen builds lack working multiprocessing primitives.
+                # PyMuPDF is not thread-safe, so the fallback runs one job at a time.
+                logger.warning("Process pool unavailable, extracting PDFs in a thread: %s", e)
+                _extraction_executor = ThreadPoolExecutor(max_workers=1)
+                _extraction_workers = 1
+        return _extraction_executor
+
+def _drop_extraction_executor(executor: Executor) -> None:
+    """Forget a broken extraction pool so the next request starts a new one."""
+    global _extraction_executor
+    # A crashed worker breaks the pool for good
+    with _extraction_executor_lock:
+        if _extraction_executor is executor:
+            _extraction_executor = None
+
+def _compare_texts_job(job: Tuple[str, str]) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """Compare two texts to completion in an extraction worker."""
+    text1, text2 = job
+    summary: Dict[str, int] = {"additions": 0, "deletions": 0, "modifications": 0}
+    differences = list(compare_texts(text1, text2, summary))
+    return differences, summary
+
+def compare_texts_in_pool(text1: str, text2: str) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """Compare two texts on the shared extraction pool, off the caller's GIL.
 
     Args:
-        pdf1_path (str): Path to the first PDF file.
-        pdf2_path (str): Path to the second PDF file.
+        text1 (str): Text from the first PDF.
+        text2 (str): Text from the second PDF.
 
     Returns:
         Tuple[List[Tuple[str, str]], Dict[str, int]]: Differences and summary of changes.
 
     Raises:
-        ValueError: If file size exceeds limit or processing fails.
+        ValueError: If the comparison fails.
+    """
+    executor = _get_extraction_executor()
+    try:
+        return executor.submit(_compare_texts_job, (text1, text2)).result()
+    except BrokenProcessPool as e:
+        _drop_extraction_executor(executor)
+        raise ValueError(f"Text comparison failed: {str(e)}")
+
+def extract_texts(pdf1_source: PdfSource, pdf2_source: PdfSource, force_refresh: bool = False) -> Tuple[str, str]:
+    """Validate two PDFs and extract their text.
+
+    Args:
+        pdf1_source (PdfSource): Path, binary file-like object, or bytes of the first PDF.
+        pdf2_source (PdfSource): Path, binary file-like object, or bytes of the second PDF.
+        force_refresh (bool): Bypass the extracted-text cache for both files.
+
+    Returns:
+        Tuple[str, str]: Extracted text of the first and second PDF.
+
+    Raises:
+        ValueError: If file size exceeds limit or extraction fails.
     """
     try:
         # Define constants
         MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
 
+        # Load both PDFs once so they can be handed to worker processes as bytes
+        data1 = _read_pdf_bytes(pdf1_source)
+        data2 = _read_pdf_bytes(pdf2_source)
+
         # Validate file sizes
-        if os.path.getsize(pdf1_path) > MAX_FILE_SIZE or os.path.getsize(pdf2_path) > MAX_FILE_SIZE:
+        if len(data1) > MAX_FILE_SIZE or len(data2) > MAX_FILE_SIZE:
             raise ValueError("File size exceeds 10MB limit")
 
-        # Extract text from both PDFs
-        text1 = extract_text_from_pdf(pdf1_path)
-        text2 = extract_text_from_pdf(pdf2_path)
-
-        # Compare the extracted texts
-        differences, summary = compare_texts(text1, text2)
-        return differences, summary
+        # Extract text from both PDFs in parallel
+        text1, text2 = _extract_with_cache(
+            [(data1, _describe_source(pdf1_source)), (data2, _describe_source(pdf2_source))],
+            force_refresh,
+        )
+        return text1, text2
 
     except ValueError as ve:
-        logger.error(f"Processing error: {str(ve)}")
+        logger.error("Processing error: %s", ve)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in PDF processing: {str(e)}")
-        raise ValueError(f"PDF processing failed: {str(e)}")
\ No newline at end of file
+        logger.error("Unexpected error in PDF processing: %s", e)
+        raise ValueError(f"PDF processing failed: {str(e)}")
+
+def process_pdfs(pdf1_source: PdfSource, pdf2_source: PdfSource, force_refresh: bool = False) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """Process two PDFs and return their comparison results.
+
+    Args:
+        pdf1_source (PdfSource): Path, binary file-like object, or bytes of the first PDF.
+        pdf2_source (PdfSource): Path, binary file-like object, or bytes of the second PDF.
+        force_refresh (bool): Bypass the extracted-text cache for both files.
+
+    Returns:
+        Tuple[List[Tuple[str, str]], Dict[str, int]]: Differences and summary of changes.
+
+    Raises:
+        ValueError: If file size exceeds limit or processing fails.
+    """
+    text1, text2 = extract_texts(pdf1_source, pdf2_source, force_refresh)
+
+    # Compare the extracted texts
+    return compare_texts_in_pool(text1, text2)
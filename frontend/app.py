@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
+import html
+import json
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 import os
 
@@ -11,53 +13,80 @@ logger = logging.getLogger(__name__)
 
 st.set_page_config(page_title="PDF Comparison Tool", layout="wide")
 
-def display_differences(differences: List[Tuple[str, str]], view_mode: str = "single") -> None:
+CONTENT_STYLE = "font-family: Arial; line-height: 1.5;"
+RENDER_BATCH_SIZE = 500  # Streamed diff rows rendered per markdown block
+
+def create_diff_layout(view_mode: str = "single") -> Sequence:
+    """Create the containers differences are rendered into.
+
+    Args:
+        view_mode (str): 'single' or 'side-by-side' display mode.
+
+    Returns:
+        Sequence: One container for single view, or (left, right) columns with headers.
+    """
+    if view_mode == "single":
+        return (st.container(),)
+    left_col, right_col = st.columns(2)
+    left_col.markdown("**Original**")
+    right_col.markdown("**Modified**")
+    return left_col, right_col
+
+def display_differences(differences: List[Tuple[str, str]], view_mode: str = "single", layout: Optional[Sequence] = None) -> None:
     """Display PDF differences with color coding in single or side-by-side view.
 
     Args:
         differences (List[Tuple[str, str]]): List of (change_type, text) tuples.
         view_mode (str): 'single' or 'side-by-side' display mode.
+        layout (Optional[Sequence]): Containers from ``create_diff_layout`` to append to,
+            so a streamed diff can be rendered batch by batch. Created if not given.
     """
+    if layout is None:
+        layout = create_diff_layout(view_mode)
+
+    # Build HTML as lists of fragments and join once, instead of repeated string concatenation
     if view_mode == "single":
-        html_content = "<div style='font-family: Arial; line-height: 1.5;'>"
+        parts: List[str] = []
+        append = parts.append
         for change_type, text in differences:
+            text = html.escape(text)
             if change_type == "added":
-                html_content += f"<span style='background-color: #90EE90;'>{text}</span>"
+                append(f"<span style='background-color: #90EE90;'>{text}</span><br>")
             elif change_type == "removed":
-                html_content += f"<span style='background-color: #FFB6C1;'>{text}</span>"
+                append(f"<span style='background-color: #FFB6C1;'>{text}</span><br>")
             elif change_type == "modified":
-                html_content += f"<span style='background-color: #FFFF99;'>{text}</span>"
+                append(f"<span style='background-color: #FFFF99;'>{text}</span><br>")
             elif change_type == "unchanged":
-                html_content += text
-            html_content += "<br>"
-        html_content += "</div>"
-        st.markdown(html_content, unsafe_allow_html=True)
+                append(f"{text}<br>")
+            else:
+                append("<br>")
+        html_content = f"<div style='{CONTENT_STYLE}'>{''.join(parts)}</div>"
+        layout[0].markdown(html_content, unsafe_allow_html=True)
     else:
-        left_col, right_col = st.columns(2)
-        left_content = "<div style='font-family: Arial; line-height: 1.5;'>"
-        right_content = "<div style='font-family: Arial; line-height: 1.5;'>"
+        left_col, right_col = layout
+        left_parts: List[str] = []
+        right_parts: List[str] = []
+        left_append = left_parts.append
+        right_append = right_parts.append
         for change_type, text in differences:
             if change_type == "added":
-                right_content += f"<span style='background-color: #90EE90;'>{text}</span><br>"
-                left_content += "<br>"
+                right_append(f"<span style='background-color: #90EE90;'>{html.escape(text)}</span><br>")
+                left_append("<br>")
             elif change_type == "removed":
-                left_content += f"<span style='background-color: #FFB6C1;'>{text}</span><br>"
-                right_content += "<br>"
+                left_append(f"<span style='background-color: #FFB6C1;'>{html.escape(text)}</span><br>")
+                right_append("<br>")
             elif change_type == "modified":
                 old, new = text.split("New: ", 1)
-                left_content += f"<span style='background-color: #FFFF99;'>{old[5:]}</span><br>"
-                right_content += f"<span style='background-color: #FFFF99;'>{new}</span><br>"
+                left_append(f"<span style='background-color: #FFFF99;'>{html.escape(old[5:])}</span><br>")
+                right_append(f"<span style='background-color: #FFFF99;'>{html.escape(new)}</span><br>")
             elif change_type == "unchanged":
-                left_content += f"{text}<br>"
-                right_content += f"{text}<br>"
-        left_content += "</div>"
-        right_content += "</div>"
-        with left_col:
-            st.markdown("**Original**")
-            st.markdown(left_content, unsafe_allow_html=True)
-        with right_col:
-            st.markdown("**Modified**")
-            st.markdown(right_content, unsafe_allow_html=True)
+                text = html.escape(text)
+                left_append(f"{text}<br>")
+                right_append(f"{text}<br>")
+        left_content = f"<div style='{CONTENT_STYLE}'>{''.join(left_parts)}</div>"
+        right_content = f"<div style='{CONTENT_STYLE}'>{''.join(right_parts)}</div>"
+        left_col.markdown(left_content, unsafe_allow_html=True)
+        right_col.markdown(right_content, unsafe_allow_html=True)
 
 def main() -> None:
     """Main function to run the Streamlit PDF comparison frontend."""
@@ -75,9 +104,13 @@ def main() -> None:
     if pdf1 and pdf2:
         if st.button("Compare PDFs"):
             with st.spinner("Comparing PDFs..."):
+                # Pass the uploaded files as file objects, rewound since an earlier run may have read them.
+                # requests still reads them to build the multipart body, so memory use is the same.
+                pdf1.seek(0)
+                pdf2.seek(0)
                 files = {
-                    "pdf1": (pdf1.name, pdf1.read(), "application/pdf"),
-                    "pdf2": (pdf2.name, pdf2.read(), "application/pdf"),
+                    "pdf1": (pdf1.name, pdf1, "application/pdf"),
+                    "pdf2": (pdf2.name, pdf2, "application/pdf"),
                 }
                 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
                 REQUEST_TIMEOUT = 30
@@ -88,22 +121,43 @@ def main() -> None:
                         f"{BACKEND_URL}/compare-pdfs/",
                         files=files,
                         timeout=REQUEST_TIMEOUT,
+                        stream=True,
                     )
                     response.raise_for_status()
-                    result = response.json()
-
-                    st.success("Comparison completed!")
-                    summary = result["summary"]
-                    st.subheader("Summary of Changes")
-                    st.write(f"Additions: {summary['additions']} (Green)")
-                    st.write(f"Deletions: {summary['deletions']} (Red)")
-                    st.write(f"Modifications: {summary['modifications']} (Yellow)")
 
+                    # The summary is the last NDJSON record, so reserve its place above the diff
+                    summary_placeholder = st.empty()
                     st.subheader("Detailed Comparison")
-                    display_differences(
-                        result["differences"],
-                        view_mode="single" if view_mode == "Single View" else "side-by-side",
-                    )
+                    mode = "single" if view_mode == "Single View" else "side-by-side"
+                    layout = create_diff_layout(mode)
+
+                    # Render the diff in batches as records arrive instead of buffering the whole response
+                    batch: List[Tuple[str, str]] = []
+                    summary = None
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        record = json.loads(line)
+                        if record["type"] == "summary":
+                            summary = record["summary"]
+                        elif record["type"] == "error":
+                            raise ValueError(record["detail"])
+                        else:
+                            batch.append((record["type"], record["text"]))
+                            if len(batch) >= RENDER_BATCH_SIZE:
+                                display_differences(batch, view_mode=mode, layout=layout)
+                                batch = []
+                    if batch:
+                        display_differences(batch, view_mode=mode, layout=layout)
+                    if summary is None:
+                        raise ValueError("Backend response ended before the summary")
+
+                    with summary_placeholder.container():
+                        st.success("Comparison completed!")
+                        st.subheader("Summary of Changes")
+                        st.write(f"Additions: {summary['additions']} (Green)")
+                        st.write(f"Deletions: {summary['deletions']} (Red)")
+                        st.write(f"Modifications: {summary['modifications']} (Yellow)")
                 except requests.exceptions.ConnectionError:
                     st.error(f"Could not connect to backend at {BACKEND_URL}. Ensure it’s running.")
                 except requests.exceptions.Timeout:
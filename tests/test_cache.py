@@ -0,0 +1,39 @@
+import os
+
+import pdf_processor
+
+
+def test_cache_path_depends_on_extraction_settings(monkeypatch):
+    digest = "0" * 64
+    default = pdf_processor._cache_path(digest)
+    assert pdf_processor._cache_path(digest) == default
+
+    monkeypatch.setattr(pdf_processor, "OCR_DPI", 150)
+    assert pdf_processor._cache_path(digest) != default
+
+    monkeypatch.undo()
+    monkeypatch.setattr(pdf_processor, "TESSERACT_CONFIG", "--oem 1 --psm 3")
+    assert pdf_processor._cache_path(digest) != default
+
+    monkeypatch.undo()
+    monkeypatch.setattr(pdf_processor, "OCR_BACKEND", "easyocr")
+    assert pdf_processor._cache_path(digest) != default
+
+
+def test_cache_evicts_least_recently_used_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_processor, "CACHE_DIR", str(tmp_path))
+    for index, digest in enumerate(["a" * 64, "b" * 64, "c" * 64]):
+        pdf_processor._store_cached_text(digest, "x" * 1000)
+        os.utime(pdf_processor._cache_path(digest), (index, index))
+
+    # Reading an entry makes it the most recently used
+    assert pdf_processor._load_cached_text("a" * 64, "a.pdf") == "x" * 1000
+
+    size = os.path.getsize(pdf_processor._cache_path("a" * 64))
+    monkeypatch.setattr(pdf_processor, "CACHE_MAX_BYTES", 2 * size)
+    pdf_processor._store_cached_text("d" * 64, "x" * 1000)
+
+    assert pdf_processor._load_cached_text("b" * 64, "b.pdf") is None
+    assert pdf_processor._load_cached_text("c" * 64, "c.pdf") is None
+    assert pdf_processor._load_cached_text("a" * 64, "a.pdf") == "x" * 1000
+    assert pdf_processor._load_cached_text("d" * 64, "d.pdf") == "x" * 1000
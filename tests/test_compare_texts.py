@@ -0,0 +1,70 @@
+import pdf_processor
+from pdf_processor import compare_texts
+
+
+def run(text1, text2):
+    summary = {"additions": 0, "deletions": 0, "modifications": 0}
+    return list(compare_texts(text1, text2, summary)), summary
+
+
+def test_equal_texts_are_unchanged():
+    differences, summary = run("a\nb\nc", "a\nb\nc")
+    assert differences == [("unchanged", "a"), ("unchanged", "b"), ("unchanged", "c")]
+    assert summary == {"additions": 0, "deletions": 0, "modifications": 0}
+
+
+def test_insert_only():
+    differences, summary = run("a\nc", "a\nb\nc")
+    assert differences == [("unchanged", "a"), ("added", "b"), ("unchanged", "c")]
+    assert summary == {"additions": 1, "deletions": 0, "modifications": 0}
+
+
+def test_delete_only():
+    differences, summary = run("a\nb\nc", "a\nc")
+    assert differences == [("unchanged", "a"), ("removed", "b"), ("unchanged", "c")]
+    assert summary == {"additions": 0, "deletions": 1, "modifications": 0}
+
+
+def test_replace_block_pairs_lines_and_keeps_leftovers():
+    differences, summary = run("a\nb1\nb2\nb3\nc", "a\nx1\nx2\nc")
+    assert differences == [
+        ("unchanged", "a"),
+        ("modified", "Old: b1\nNew: x1"),
+        ("modified", "Old: b2\nNew: x2"),
+        ("removed", "b3"),
+        ("unchanged", "c"),
+    ]
+    assert summary == {"additions": 0, "deletions": 1, "modifications": 2}
+
+
+def test_trailing_newline_does_not_count_as_a_change():
+    differences, summary = run("a\nb", "a\nb\n")
+    assert differences == [("unchanged", "a"), ("unchanged", "b")]
+    assert summary == {"additions": 0, "deletions": 0, "modifications": 0}
+
+
+def test_trailing_line_added():
+    differences, summary = run("a\nb\n", "a\nb\nc")
+    assert differences == [("unchanged", "a"), ("unchanged", "b"), ("added", "c")]
+    assert summary == {"additions": 1, "deletions": 0, "modifications": 0}
+
+
+def test_timeout_falls_back_to_a_complete_line_diff(monkeypatch):
+    text1 = "\n".join(f"line {i}" for i in range(300))
+    text2 = "\n".join(f"line {i}" if i % 3 else f"changed {i}" for i in range(300))
+    expected, expected_summary = run(text1, text2)
+
+    fallback_calls = []
+    sequence_matcher_diff = pdf_processor._sequence_matcher_diff
+
+    def spy(chars1, chars2):
+        fallback_calls.append(len(chars1))
+        return sequence_matcher_diff(chars1, chars2)
+
+    monkeypatch.setattr(pdf_processor, "_sequence_matcher_diff", spy)
+    monkeypatch.setattr(pdf_processor, "DIFF_TIMEOUT", 1e-9)
+    differences, summary = run(text1, text2)
+
+    assert fallback_calls == [300]
+    assert differences == expected
+    assert summary == expected_summary == {"additions": 0, "deletions": 0, "modifications": 100}
@@ -0,0 +1,21 @@
+import fitz
+
+import pdf_processor
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        for index, line in enumerate(lines):
+            page.insert_text((72, 72 + 14 * index), line)
+    return doc.tobytes()
+
+
+def test_page_boundaries_do_not_add_blank_lines(monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_processor, "CACHE_DIR", str(tmp_path))
+    data = make_pdf([["first page", "second line"], ["next page"]])
+
+    text = pdf_processor.extract_text_from_pdf(data, force_refresh=True)
+
+    assert text.splitlines() == ["first page", "second line", "next page"]